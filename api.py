@@ -0,0 +1,392 @@
+import os
+import json
+import asyncio
+import functools
+from contextvars import ContextVar
+from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs, unquote
+from dotenv import load_dotenv
+from modules.user_manager import UserManager
+from modules.meeting_scheduler import MeetingScheduler
+from modules.file_organizer import FileOrganizer
+from modules.llm_interface import LLMInterface
+from modules.conversation_memory import ConversationMemory
+from modules.profiling import profiler
+
+load_dotenv()
+
+repo_id = os.getenv("REPO_ID")
+task = os.getenv("TASK")
+teams_file = os.getenv("TEAMS_FILE")
+schedule_file = os.getenv("SCHEDULE_FILE")
+sample_files_dir = os.getenv("SAMPLE_FILES_DIR")
+file_categories_dir = os.getenv("FILE_CATEGORIES_DIR")
+hugging_face_token = os.getenv("HUGGING_FACE_TOKEN")
+model_kwargs = {"temperature": 0.5, "top_p": 0.95, "max_length": 512}
+user_data_dir = os.getenv("USER_DATA_DIR")
+duplicate_action = os.getenv("FILE_DUPLICATE_ACTION", "skip")
+api_host = os.getenv("API_HOST", "127.0.0.1")
+api_port = int(os.getenv("API_PORT", "8080"))
+api_workers = int(os.getenv("API_WORKERS", "8"))
+
+MAX_BODY_SIZE = 1024 * 1024
+MAX_HR_SESSIONS = 1000
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+current_route = ContextVar("current_route", default="api")
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class AppState:
+    def __init__(self, user_manager, scheduler, file_organizer, llm_interface, workers):
+        self.user_manager = user_manager
+        self.scheduler = scheduler
+        self.file_organizer = file_organizer
+        self.llm_interface = llm_interface
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="api-worker"
+        )
+        self.schedule_lock = asyncio.Lock()
+        self.files_lock = asyncio.Lock()
+        self.hr_sessions = OrderedDict()
+
+    def hr_memory(self, session_id):
+        if session_id is None:
+            return None
+
+        memory = self.hr_sessions.pop(session_id, None) or ConversationMemory()
+        self.hr_sessions[session_id] = memory
+        while len(self.hr_sessions) > MAX_HR_SESSIONS:
+            self.hr_sessions.popitem(last=False)
+        return memory
+
+    async def run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        if profiler.enabled:
+            func = functools.partial(profiled_call, current_route.get(), func)
+        return await loop.run_in_executor(self.executor, func, *args)
+
+
+def profiled_call(name, func, *args):
+    with profiler.profile_request(name):
+        return func(*args)
+
+
+def require(body, field):
+    if field not in body:
+        raise HTTPError(400, f"Missing field: {field}")
+    return body[field]
+
+
+def number_field(body, field, default, cast):
+    try:
+        return cast(body.get(field, default))
+    except (TypeError, ValueError, OverflowError):
+        raise HTTPError(400, f"Invalid {field}: must be a number")
+
+
+def date_field(body, field):
+    value = body.get(field)
+    if value is None:
+        return None
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"Invalid {field}: expected YYYY-MM-DD")
+    return value
+
+
+def require_participants(body):
+    participants = require(body, "participants")
+    if not isinstance(participants, list) or not all(
+        isinstance(name, str) for name in participants
+    ):
+        raise HTTPError(400, "Invalid participants: must be a list of names")
+    return participants
+
+
+def require_slot(body):
+    slot = require(body, "slot")
+    if not isinstance(slot, dict):
+        raise HTTPError(400, "Invalid slot: must be an object")
+    for field, fmt in (
+        ("date", "%Y-%m-%d"),
+        ("start_time", "%H:%M"),
+        ("end_time", "%H:%M"),
+    ):
+        try:
+            datetime.strptime(slot[field], fmt)
+        except KeyError:
+            raise HTTPError(400, f"Invalid slot: missing {field}")
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"Invalid slot: bad {field}")
+    return slot
+
+
+async def health(state, query, body):
+    return 200, {"status": "ok"}
+
+
+async def list_employees(state, query, body):
+    return 200, {"employees": state.scheduler.get_all_employees()}
+
+
+async def list_teams(state, query, body):
+    teams = state.scheduler.get_all_teams()
+    return 200, {
+        "teams": {team: state.scheduler.get_team_members(team) for team in teams}
+    }
+
+
+async def find_slots(state, query, body):
+    participants = require_participants(body)
+    duration = number_field(body, "duration", 1.0, float)
+    days_ahead = number_field(body, "days_ahead", 10, int)
+    start_date = date_field(body, "start_date")
+    if not 0 < duration <= 24:
+        raise HTTPError(400, "Invalid duration: must be between 0 and 24 hours")
+    if days_ahead < 0:
+        raise HTTPError(400, "Invalid days_ahead: must not be negative")
+    slots = await state.run(
+        state.scheduler.find_available_slots,
+        participants,
+        duration,
+        start_date,
+        days_ahead,
+    )
+    return 200, {"slots": slots}
+
+
+async def book_slot(state, query, body):
+    participants = require_participants(body)
+    slot = require_slot(body)
+    if state.scheduler.slot_hours(slot) is None:
+        raise HTTPError(
+            400, "Invalid slot: must be whole hours on a work day, outside lunch"
+        )
+
+    async with state.schedule_lock:
+        booked = await state.run(state.scheduler.book_if_available, participants, slot)
+
+    if not booked:
+        raise HTTPError(409, "Slot is no longer available")
+
+    return 201, {"booked": True, "slot": slot, "participants": participants}
+
+
+async def list_files(state, query, body):
+    return 200, {"files": await state.run(state.file_organizer.list_files)}
+
+
+async def organize_files(state, query, body):
+    async with state.files_lock:
+        results = await state.run(state.file_organizer.organize_files)
+        duplicates = dict(state.file_organizer.duplicates)
+
+    return 200, {"results": results or {}, "duplicates": duplicates}
+
+
+async def hr_query(state, query, body):
+    question = require(body, "query")
+    if not isinstance(question, str) or not question.strip():
+        raise HTTPError(400, "Invalid query: must be a non-empty string")
+    session_id = body.get("session_id")
+    if session_id is not None and not isinstance(session_id, str):
+        raise HTTPError(400, "Invalid session_id: must be a string")
+    memory = state.hr_memory(session_id)
+    answer = await state.run(state.llm_interface.process_hr_query, question, memory)
+    return 200, {"query": question, "response": answer}
+
+
+async def find_users(state, query, body):
+    user_manager = state.user_manager
+
+    if "email" in query:
+        user = await state.run(user_manager.find_user_by_email, query["email"][0])
+        users = [user] if user else []
+    elif "phone" in query:
+        user = await state.run(user_manager.find_user_by_phone, query["phone"][0])
+        users = [user] if user else []
+    elif "name" in query:
+        users = await state.run(user_manager.find_users_by_name, query["name"][0])
+    elif "skills" in query:
+        users = await state.run(user_manager.search_resumes, query["skills"][0])
+    else:
+        raise HTTPError(400, "Provide one of: email, phone, name, skills")
+
+    return 200, {"users": users}
+
+
+async def get_user(state, employee_id):
+    user = await state.run(state.user_manager.get_user_data, employee_id)
+    if user is None:
+        raise HTTPError(404, f"User not found: {employee_id}")
+    return 200, user
+
+
+ROUTES = {
+    ("GET", "/health"): health,
+    ("GET", "/employees"): list_employees,
+    ("GET", "/teams"): list_teams,
+    ("POST", "/slots"): find_slots,
+    ("POST", "/bookings"): book_slot,
+    ("GET", "/files"): list_files,
+    ("POST", "/files/organize"): organize_files,
+    ("POST", "/hr/query"): hr_query,
+    ("GET", "/users"): find_users,
+}
+
+
+async def dispatch(state, method, target, body):
+    url = urlsplit(target)
+    path = url.path.rstrip("/") or "/"
+    query = parse_qs(url.query)
+
+    handler = ROUTES.get((method, path))
+    if handler is not None:
+        current_route.set(f"api_{handler.__name__}")
+        return await handler(state, query, body)
+
+    if path.startswith("/users/"):
+        if method != "GET":
+            raise HTTPError(405, "Method not allowed")
+        current_route.set("api_get_user")
+        return await get_user(state, unquote(path[len("/users/") :]))
+
+    if any(route_path == path for _, route_path in ROUTES):
+        raise HTTPError(405, "Method not allowed")
+
+    raise HTTPError(404, f"No route for {path}")
+
+
+async def read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", "0") or 0)
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length header")
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length header")
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(413, "Request body too large")
+
+    body = {}
+    if length:
+        raw = await reader.readexactly(length)
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            raise HTTPError(400, "Request body must be JSON")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+
+    keep_alive = (
+        headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+    )
+    return method.upper(), target, body, keep_alive
+
+
+def write_response(writer, status, payload, keep_alive):
+    data = json.dumps(payload, default=str).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + data)
+
+
+async def handle_connection(state, reader, writer):
+    try:
+        while True:
+            keep_alive = False
+            try:
+                request = await read_request(reader)
+                if request is None:
+                    break
+
+                method, target, body, keep_alive = request
+                status, payload = await dispatch(state, method, target, body)
+            except HTTPError as e:
+                status, payload = e.status, {"error": e.message}
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception as e:
+                print(f"Error handling request: {e}")
+                status, payload = 500, {"error": "Internal server error"}
+
+            write_response(writer, status, payload, keep_alive)
+            await writer.drain()
+
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+def create_state():
+    user_manager = UserManager(user_data_dir)
+    llm_interface = LLMInterface(repo_id, task, model_kwargs, hugging_face_token)
+    scheduler = MeetingScheduler(teams_file, schedule_file)
+    file_organizer = FileOrganizer(
+        repo_id,
+        task,
+        sample_files_dir,
+        file_categories_dir,
+        model_kwargs,
+        hugging_face_token,
+        duplicate_action,
+    )
+    return AppState(user_manager, scheduler, file_organizer, llm_interface, api_workers)
+
+
+async def serve(state, host=api_host, port=api_port):
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(state, reader, writer), host, port
+    )
+    print(f"Corporate Companion API listening on http://{host}:{port}")
+
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(create_state()))
+    except KeyboardInterrupt:
+        pass
@@ -7,11 +7,13 @@ from modules.meeting_scheduler import MeetingScheduler
 from modules.file_organizer import FileOrganizer
 from modules.llm_interface import LLMInterface
 from modules.utils import sanitize_text, normalize_phone
+from modules.profiling import profiler, DEFAULT_MODES
+from modules.conversation_memory import ConversationMemory
 
 load_dotenv()
 
 repo_id = os.getenv("REPO_ID")
-task = os.getenv("TASK")
+llm_task = os.getenv("TASK")
 teams_file = os.getenv("TEAMS_FILE")
 schedule_file = os.getenv("SCHEDULE_FILE")
 sample_files_dir = os.getenv("SAMPLE_FILES_DIR")
@@ -19,9 +21,16 @@ file_categories_dir = os.getenv("FILE_CATEGORIES_DIR")
 hugging_face_token = os.getenv("HUGGING_FACE_TOKEN")
 model_kwargs = {"temperature": 0.5, "top_p": 0.95, "max_length": 512}
 user_data_dir = os.getenv("USER_DATA_DIR")
+chat_history_limit = 50
+chat_window = 10
+duplicate_action = os.getenv("FILE_DUPLICATE_ACTION", "skip")
 
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
+if "hr_memory" not in st.session_state:
+    st.session_state.hr_memory = ConversationMemory()
+if "last_hr_query" not in st.session_state:
+    st.session_state.last_hr_query = ""
 if "current_task" not in st.session_state:
     st.session_state.current_task = "intro"
 if "user_info_collected" not in st.session_state:
@@ -31,22 +40,35 @@ if "upload_resume" not in st.session_state:
 if "employee_id" not in st.session_state:
     st.session_state.employee_id = ""
 
-user_manager = UserManager(user_data_dir)
-llm_interface = LLMInterface(
-    repo_id,
-    task,
-    model_kwargs,
-    hugging_face_token,
-)
-scheduler = MeetingScheduler(teams_file, schedule_file)
-file_organizer = FileOrganizer(
-    repo_id,
-    task,
-    sample_files_dir,
-    file_categories_dir,
-    model_kwargs,
-    hugging_face_token,
-)
+
+def get_user_manager():
+    return UserManager(user_data_dir)
+
+
+def get_llm_interface():
+    return LLMInterface(
+        repo_id,
+        llm_task,
+        model_kwargs,
+        hugging_face_token,
+    )
+
+
+def get_scheduler():
+    return MeetingScheduler(teams_file, schedule_file)
+
+
+def get_file_organizer():
+    return FileOrganizer(
+        repo_id,
+        llm_task,
+        sample_files_dir,
+        file_categories_dir,
+        model_kwargs,
+        hugging_face_token,
+        duplicate_action,
+    )
+
 
 st.title("Corporate Companion")
 st.subheader("Your AI-powered Employee Assistant")
@@ -70,240 +92,303 @@ with st.sidebar:
     st.divider()
     if st.button("Clear Chat History"):
         st.session_state.chat_history = []
+        st.session_state.hr_memory.clear()
         st.experimental_rerun()
 
-if (
-    st.session_state.current_task == "intro"
-    or st.session_state.current_task == "user_info"
-):
-    if not st.session_state.get("user_info_collected", False):
-        st.write("Welcome! Let's start by collecting some basic information.")
-
-        st.subheader("Employee Identification")
-        employee_id = st.text_input("Employee ID (Required)", key="employee_id_input")
-
-        col1, col2 = st.columns(2)
-        with col1:
-            name = st.text_input("Name", key="name_input")
-
-        with col2:
-            email = st.text_input("Email", key="email_input")
-            phone = st.text_input("Phone Number", key="phone_input")
-
-        with st.expander("Additional Information (Optional)"):
-            department = st.text_input("Department", key="department_input")
-            office_location = st.text_input(
-                "Office Location", key="office_location_input"
+    profiling_enabled = st.toggle(
+        "Enable profiling (all sessions)",
+        value=profiler.enabled,
+        help="Profiling is process-wide: it applies to every session served by "
+        "this app until it is turned off again.",
+    )
+    if profiling_enabled != profiler.enabled:
+        profiler.configure(modes=DEFAULT_MODES if profiling_enabled else ())
+    if profiler.enabled:
+        st.caption(f"Writing profiles to {profiler.profile_dir}")
+
+with profiler.profile_request(st.session_state.current_task):
+    if (
+        st.session_state.current_task == "intro"
+        or st.session_state.current_task == "user_info"
+    ):
+        user_manager = get_user_manager()
+
+        if not st.session_state.get("user_info_collected", False):
+            st.write("Welcome! Let's start by collecting some basic information.")
+
+            st.subheader("Employee Identification")
+            employee_id = st.text_input(
+                "Employee ID (Required)", key="employee_id_input"
             )
 
-        resume_file = st.file_uploader("Upload Resume (PDF)", type=["pdf"])
-
-        if st.button("Submit Information"):
-            if not employee_id.strip():
-                st.error("Employee ID is required")
-            else:
-                validation_results = user_manager.validate_user_info(name, email, phone)
-                if validation_results["valid"]:
-                    user_data = {
-                        "name": sanitize_text(name, default="Anonymous User"),
-                        "email": sanitize_text(email),
-                        "phone": normalize_phone(phone),
-                        "department": sanitize_text(department),
-                        "employee_id": employee_id,
-                        "office_location": sanitize_text(office_location),
-                        "has_resume": resume_file is not None,
-                    }
-                    if resume_file:
-                        user_manager.save_resume(resume_file, employee_id)
-
-                    user_manager.save_user_data(user_data)
-
-                    st.session_state.user_info_collected = True
-                    st.session_state.employee_id = employee_id
-                    st.success("Information saved successfully!")
-                    st.experimental_rerun()
-                else:
-                    for field, message in validation_results["errors"].items():
-                        if message:
-                            st.error(f"{field}: {message}")
-    else:
-        employee_id = st.session_state.get("employee_id", "")
-        user_data = user_manager.get_user_data(user_identifier=employee_id)
-        if user_data:
-            st.write(f"### Welcome, {user_data.get('name', 'User')}!")
-
             col1, col2 = st.columns(2)
             with col1:
-                st.write("**Contact Information**")
-                st.write(f"Email: {user_data.get('email', 'Not provided')}")
-                st.write(f"Phone: {user_data.get('phone', 'Not provided')}")
+                name = st.text_input("Name", key="name_input")
 
             with col2:
-                st.write("**Employment Details**")
-                st.write(f"Department: {user_data.get('department', 'Not provided')}")
-                st.write(f"Employee ID: {user_data.get('employee_id', 'Not provided')}")
-                st.write(
-                    f"Office Location: {user_data.get('office_location', 'Not provided')}"
-                )
+                email = st.text_input("Email", key="email_input")
+                phone = st.text_input("Phone Number", key="phone_input")
 
-            if user_data.get("has_resume", False):
-                st.write("Resume: Uploaded ✓")
-            else:
-                st.write("Resume: Not uploaded")
+            with st.expander("Additional Information (Optional)"):
+                department = st.text_input("Department", key="department_input")
+                office_location = st.text_input(
+                    "Office Location", key="office_location_input"
+                )
 
-            if st.button("Update Information"):
-                st.session_state.user_info_collected = False
-                st.experimental_rerun()
+            resume_file = st.file_uploader("Upload Resume (PDF)", type=["pdf"])
 
-elif st.session_state.current_task == "scheduler":
-    st.header("Meeting Scheduler")
+            if st.button("Submit Information"):
+                if not employee_id.strip():
+                    st.error("Employee ID is required")
+                else:
+                    validation_results = user_manager.validate_user_info(
+                        name, email, phone
+                    )
+                    if validation_results["valid"]:
+                        user_data = {
+                            "name": sanitize_text(name, default="Anonymous User"),
+                            "email": sanitize_text(email),
+                            "phone": normalize_phone(phone),
+                            "department": sanitize_text(department),
+                            "employee_id": employee_id,
+                            "office_location": sanitize_text(office_location),
+                            "has_resume": resume_file is not None,
+                        }
+                        if resume_file:
+                            user_manager.save_resume(resume_file, employee_id)
+
+                        user_manager.save_user_data(user_data)
+
+                        st.session_state.user_info_collected = True
+                        st.session_state.employee_id = employee_id
+                        st.success("Information saved successfully!")
+                        st.experimental_rerun()
+                    else:
+                        for field, message in validation_results["errors"].items():
+                            if message:
+                                st.error(f"{field}: {message}")
+        else:
+            employee_id = st.session_state.get("employee_id", "")
+            user_data = user_manager.get_user_data(user_identifier=employee_id)
+            if user_data:
+                st.write(f"### Welcome, {user_data.get('name', 'User')}!")
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.write("**Contact Information**")
+                    st.write(f"Email: {user_data.get('email', 'Not provided')}")
+                    st.write(f"Phone: {user_data.get('phone', 'Not provided')}")
+
+                with col2:
+                    st.write("**Employment Details**")
+                    st.write(
+                        f"Department: {user_data.get('department', 'Not provided')}"
+                    )
+                    st.write(
+                        f"Employee ID: {user_data.get('employee_id', 'Not provided')}"
+                    )
+                    st.write(
+                        f"Office Location: {user_data.get('office_location', 'Not provided')}"
+                    )
 
-    meeting_type = st.radio(
-        "Schedule meeting with:",
-        ["Individual Employee", "Multiple Employees", "Entire Team"],
-    )
+                if user_data.get("has_resume", False):
+                    st.write("Resume: Uploaded ✓")
+                else:
+                    st.write("Resume: Not uploaded")
 
-    if meeting_type == "Individual Employee":
-        employee = st.selectbox("Select employee:", scheduler.get_all_employees())
-        participants = [employee]
-    elif meeting_type == "Multiple Employees":
-        participants = st.multiselect(
-            "Select employees:", scheduler.get_all_employees()
-        )
-    else:
-        team = st.selectbox("Select team:", scheduler.get_all_teams())
-        participants = scheduler.get_team_members(team)
-        st.write(f"Team members: {', '.join(participants)}")
+                if st.button("Update Information"):
+                    st.session_state.user_info_collected = False
+                    st.experimental_rerun()
 
-    duration = st.number_input(
-        "Meeting duration (hours):", min_value=0.5, max_value=3.0, value=1.0, step=0.5
-    )
+    elif st.session_state.current_task == "scheduler":
+        st.header("Meeting Scheduler")
+        scheduler = get_scheduler()
 
-    col1, col2 = st.columns(2)
-    with col1:
-        start_date = st.date_input("Start looking from date:")
-    with col2:
-        days_to_search = st.number_input(
-            "Number of days to search:", min_value=1, max_value=14, value=5, step=1
+        meeting_type = st.radio(
+            "Schedule meeting with:",
+            ["Individual Employee", "Multiple Employees", "Entire Team"],
         )
 
-    if st.button("Find Available Slots"):
-        if participants:
-            with st.spinner("Finding available slots..."):
-                available_slots = scheduler.find_available_slots(
-                    participants, duration, start_date, days_to_search
-                )
+        if meeting_type == "Individual Employee":
+            employee = st.selectbox("Select employee:", scheduler.get_all_employees())
+            participants = [employee]
+        elif meeting_type == "Multiple Employees":
+            participants = st.multiselect(
+                "Select employees:", scheduler.get_all_employees()
+            )
+        else:
+            team = st.selectbox("Select team:", scheduler.get_all_teams())
+            participants = scheduler.get_team_members(team)
+            st.write(f"Team members: {', '.join(participants)}")
+
+        duration = st.number_input(
+            "Meeting duration (hours):",
+            min_value=0.5,
+            max_value=3.0,
+            value=1.0,
+            step=0.5,
+        )
 
-                if available_slots:
-                    st.success(f"Found {len(available_slots)} available slots!")
+        col1, col2 = st.columns(2)
+        with col1:
+            start_date = st.date_input("Start looking from date:")
+        with col2:
+            days_to_search = st.number_input(
+                "Number of days to search:", min_value=1, max_value=14, value=5, step=1
+            )
 
-                    slots_container = st.container()
+        if st.button("Find Available Slots"):
+            if participants:
+                with st.spinner("Finding available slots..."):
+                    available_slots = scheduler.find_available_slots(
+                        participants, duration, start_date, days_to_search
+                    )
 
-                    st.markdown(
-                        """
-                        <style>
-                        .scrollable-slots-container {
-                            max-height: 400px;
-                            overflow-y: scroll;
-                            padding-right: 10px;
-                        }
+                    if available_slots:
+                        st.success(f"Found {len(available_slots)} available slots!")
 
-                        .slot-entry {
-                            padding: 10px;
-                            margin-bottom: 8px;
-                            border: 1px solid #e0e0e0;
-                            border-radius: 5px;
-                            background-color: #f9f9f9;
-                        }
-                        </style>
-                    """,
-                        unsafe_allow_html=True,
-                    )
+                        slots_container = st.container()
 
-                    with slots_container:
                         st.markdown(
-                            '<div class="scrollable-slots-container">',
+                            """
+                            <style>
+                            .scrollable-slots-container {
+                                max-height: 400px;
+                                overflow-y: scroll;
+                                padding-right: 10px;
+                            }
+
+                            .slot-entry {
+                                padding: 10px;
+                                margin-bottom: 8px;
+                                border: 1px solid #e0e0e0;
+                                border-radius: 5px;
+                                background-color: #f9f9f9;
+                            }
+                            </style>
+                        """,
                             unsafe_allow_html=True,
                         )
 
-                        for i, slot in enumerate(available_slots, 1):
-                            slot_date = slot["date"]
-                            day_of_week = datetime.strptime(
-                                slot_date, "%Y-%m-%d"
-                            ).strftime("%A")
-                            slot_str = f"{slot_date} ({day_of_week}) from {slot['start_time']} to {slot['end_time']}"
-
-                            slot_key = f"slot_{slot_date}_{slot['start_time'].replace(':', '')}"
-
-                            col1, col2 = st.columns([3, 1])
-                            with col1:
-                                st.write(f"**Slot {i}:** {slot_str}")
-                            with col2:
-                                if st.button("Book", key=f"book_{slot_key}"):
-                                    scheduler.book_meeting(participants, slot)
-                                    st.success(
-                                        f"Meeting booked for {slot_str} with {', '.join(participants)}!"
-                                    )
-                                    st.balloons()
+                        with slots_container:
+                            st.markdown(
+                                '<div class="scrollable-slots-container">',
+                                unsafe_allow_html=True,
+                            )
+
+                            for i, slot in enumerate(available_slots, 1):
+                                slot_date = slot["date"]
+                                day_of_week = datetime.strptime(
+                                    slot_date, "%Y-%m-%d"
+                                ).strftime("%A")
+                                slot_str = f"{slot_date} ({day_of_week}) from {slot['start_time']} to {slot['end_time']}"
+
+                                slot_key = f"slot_{slot_date}_{slot['start_time'].replace(':', '')}"
+
+                                col1, col2 = st.columns([3, 1])
+                                with col1:
+                                    st.write(f"**Slot {i}:** {slot_str}")
+                                with col2:
+                                    if st.button("Book", key=f"book_{slot_key}"):
+                                        scheduler.book_meeting(participants, slot)
+                                        st.success(
+                                            f"Meeting booked for {slot_str} with {', '.join(participants)}!"
+                                        )
+                                        st.balloons()
+
+                                st.markdown("</div>", unsafe_allow_html=True)
 
                             st.markdown("</div>", unsafe_allow_html=True)
+                    else:
+                        st.error(
+                            "No available slots found in the specified date range."
+                        )
+            else:
+                st.warning("Please select at least one participant.")
 
-                        st.markdown("</div>", unsafe_allow_html=True)
-                else:
-                    st.error("No available slots found in the specified date range.")
+    elif st.session_state.current_task == "file_organizer":
+        st.header("Intelligent File Organizer")
+        file_organizer = get_file_organizer()
+
+        files = file_organizer.list_files()
+        if files:
+            st.write("### Current Files:")
+            for file in files:
+                st.write(f"- {file}")
         else:
-            st.warning("Please select at least one participant.")
-
-elif st.session_state.current_task == "file_organizer":
-    st.header("Intelligent File Organizer")
-
-    files = file_organizer.list_files()
-    if files:
-        st.write("### Current Files:")
-        for file in files:
-            st.write(f"- {file}")
-    else:
-        st.write(
-            "No files found in the directory. Please first create some files in the directory (/data/sample_files/)"
-        )
+            st.write(
+                "No files found in the directory. Please first create some files in the directory (/data/sample_files/)"
+            )
 
-    if st.button("Organize Files"):
-        with st.spinner("Analyzing and organizing files..."):
-            results = file_organizer.organize_files()
+        if st.button("Organize Files"):
+            with st.spinner("Analyzing and organizing files..."):
+                results = file_organizer.organize_files()
 
-            if results:
-                st.success("Files organized successfully!")
+                if results or file_organizer.duplicates:
+                    st.success("Files organized successfully!")
 
-                for category, files in results.items():
-                    st.write(f"**{category.title()}** category:")
-                    for file in files:
-                        st.write(f"- {file}")
-            else:
-                st.error(
-                    "Error organizing files. Please try again. The sample_files directory should contain some files to organize. It can happen that it may be empty. Please check it once"
-                )
+                    for category, files in results.items():
+                        st.write(f"**{category.title()}** category:")
+                        for file in files:
+                            st.write(f"- {file}")
 
-elif st.session_state.current_task == "hr_assistance":
-    st.header("HR Policy Assistant")
+                    if file_organizer.duplicates:
+                        st.write("**Duplicates detected:**")
+                        for file, duplicate in file_organizer.duplicates.items():
+                            st.write(
+                                f"- {file} (same content as {duplicate['original']})"
+                            )
+                else:
+                    st.error(
+                        "Error organizing files. Please try again. The sample_files directory should contain some files to organize. It can happen that it may be empty. Please check it once"
+                    )
 
-    user_query = st.text_input(
-        "Ask a question about HR policies, upcoming events, or company information:"
-    )
+    elif st.session_state.current_task == "hr_assistance":
+        st.header("HR Policy Assistant")
+        llm_interface = get_llm_interface()
+        user_manager = get_user_manager()
 
-    if user_query:
-        st.session_state.chat_history.append({"role": "user", "content": user_query})
+        user_query = st.text_input(
+            "Ask a question about HR policies, upcoming events, or company information:"
+        )
 
-        with st.spinner("Processing..."):
-            response = llm_interface.process_hr_query(user_query)
+        if user_query and user_query != st.session_state.last_hr_query:
+            st.session_state.last_hr_query = user_query
             st.session_state.chat_history.append(
-                {"role": "assistant", "content": response}
+                {"role": "user", "content": user_query}
             )
 
-    for message in st.session_state.chat_history:
-        if message["role"] == "user":
-            st.write(f"**You:** {message['content']}")
-        else:
-            st.write(f"**Assistant:** {message['content']}")
+            with st.spinner("Processing..."):
+                response = llm_interface.process_hr_query(
+                    user_query, st.session_state.hr_memory
+                )
+                st.session_state.chat_history.append(
+                    {"role": "assistant", "content": response}
+                )
+
+            del st.session_state.chat_history[:-chat_history_limit]
+
+        hidden_messages = len(st.session_state.chat_history) - chat_window
+        if hidden_messages > 0:
+            st.caption(f"{hidden_messages} earlier messages hidden")
+
+        for message in st.session_state.chat_history[-chat_window:]:
+            if message["role"] == "user":
+                st.write(f"**You:** {message['content']}")
+            else:
+                st.write(f"**Assistant:** {message['content']}")
+
+        with st.expander("Search resumes by skill"):
+            skills_query = st.text_input("Skills (comma or space separated):")
+            if skills_query:
+                matches = user_manager.search_resumes(skills_query)
+                if matches:
+                    for match in matches:
+                        st.write(
+                            f"- {match.get('name', 'Unknown')} ({match['employee_id']}): {os.path.basename(match['resume'])}"
+                        )
+                else:
+                    st.write("No resumes matched the given skills.")
 
 st.divider()
 st.caption("Corporate Companion | Developed by Ashutosh Kumar Jha")
@@ -0,0 +1,373 @@
+import os
+import csv
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+from datetime import date, timedelta
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from modules.meeting_scheduler import MeetingScheduler
+from modules.file_organizer import FileOrganizer
+from modules.llm_interface import LLMInterface
+
+FILE_TEMPLATES = [
+    "quarterly_report.pdf",
+    "balance_sheet.xlsx",
+    "annual_budget.xlsx",
+    "expense_report.pdf",
+    "tax_documentation.pdf",
+    "employee_policy.docx",
+    "leave_form.pdf",
+    "onboarding_checklist.docx",
+    "performance_review.docx",
+    "benefits_overview.pdf",
+]
+HR_QUERIES = [
+    "How many days of paid leave do I get?",
+    "What is the remote work policy?",
+    "When is the company picnic?",
+    "Which holidays does the company observe?",
+    "What is the dress code?",
+]
+HR_FALLBACK = "I'm sorry, I couldn't process your query."
+OPERATIONS = {"search": 0.45, "book": 0.2, "organize": 0.15, "hr_query": 0.2}
+
+
+class LLMFallbackError(Exception):
+    pass
+
+
+def business_days(start, count):
+    days = []
+    current = start
+    while len(days) < count:
+        if current.weekday() < 5:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+def create_synthetic_data(data_dir, employees, teams, days, start, rng):
+    os.makedirs(data_dir, exist_ok=True)
+    names = [f"Employee {i:04d}" for i in range(1, employees + 1)]
+    dates = [d.strftime("%Y-%m-%d") for d in business_days(start, days)]
+
+    teams_file = os.path.join(data_dir, "employee_teams.csv")
+    with open(teams_file, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Employee", "Team"])
+        for i, name in enumerate(names):
+            writer.writerow([name, f"Team {i % teams + 1}"])
+
+    schedules_file = os.path.join(data_dir, "employee_schedules.csv")
+    with open(schedules_file, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([""] + dates)
+        for name in names:
+            row = [name]
+            for _ in dates:
+                hours = sorted(rng.sample(range(9, 18), rng.randint(0, 4)))
+                row.append(", ".join(f"{hour:02d}:00" for hour in hours))
+            writer.writerow(row)
+
+    sample_files_dir = os.path.join(data_dir, "sample_files")
+    categories_dir = os.path.join(data_dir, "categories")
+    os.makedirs(sample_files_dir, exist_ok=True)
+    os.makedirs(categories_dir, exist_ok=True)
+
+    return {
+        "employees": names,
+        "dates": dates,
+        "teams_file": teams_file,
+        "schedules_file": schedules_file,
+        "sample_files_dir": sample_files_dir,
+        "categories_dir": categories_dir,
+    }
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.data = create_synthetic_data(
+            args.data_dir,
+            args.employees,
+            args.teams,
+            args.days,
+            date.fromisoformat(args.start_date),
+            self.rng,
+        )
+
+        self.scheduler = MeetingScheduler(
+            self.data["teams_file"], self.data["schedules_file"]
+        )
+        self.llm_interface = self.create_llm_interface()
+        self.file_organizer = FileOrganizer(
+            None,
+            None,
+            self.data["sample_files_dir"],
+            self.data["categories_dir"],
+            {},
+            None,
+            args.duplicate_action,
+        )
+        self.file_organizer.llm_interface = self.create_llm_interface()
+
+        self.lock = threading.Lock()
+        self.organize_lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.outcomes = defaultdict(int)
+        self.bookings = []
+        self.created_files = []
+
+    def create_llm_interface(self):
+        from modules.llm_backends import MockLLM
+
+        llm_interface = LLMInterface(None, None, {}, None)
+        llm_interface.llm = MockLLM(
+            latency=self.args.llm_latency, failure_rate=self.args.llm_failure_rate
+        )
+        return llm_interface
+
+    def record(self, operation, elapsed, outcome=None, error=None):
+        with self.lock:
+            self.latencies[operation].append(elapsed)
+            if error is not None:
+                self.errors[operation] += 1
+            if outcome is not None:
+                self.outcomes[f"{operation}:{outcome}"] += 1
+
+    def search(self, rng):
+        participants = rng.sample(self.data["employees"], rng.randint(1, 3))
+        return self.scheduler.find_available_slots(
+            participants,
+            float(rng.choice([1, 2])),
+            rng.choice(self.data["dates"]),
+            self.args.search_days,
+        )
+
+    def book(self, rng):
+        participants = rng.sample(self.data["employees"], rng.randint(1, 3))
+        slots = self.scheduler.find_available_slots(
+            participants, 1.0, rng.choice(self.data["dates"]), self.args.search_days
+        )
+        slots = [slot for slot in slots if slot["date"] in self.data["dates"]]
+        if not slots:
+            return "no_slot"
+
+        slot = rng.choice(slots)
+        if not self.scheduler.book_if_available(participants, slot):
+            return "conflict"
+
+        with self.lock:
+            self.bookings.append((participants, slot))
+        return "booked"
+
+    def organize(self, rng, user_id, counter):
+        for i in range(self.args.files_per_batch):
+            template = rng.choice(FILE_TEMPLATES)
+            filename = f"u{user_id:04d}_{counter:04d}_{i}_{template}"
+            if rng.random() < self.args.duplicate_rate:
+                content = f"shared content for {template}"
+            else:
+                content = f"{filename} {rng.random()}"
+
+            with open(os.path.join(self.data["sample_files_dir"], filename), "w") as f:
+                f.write(content)
+            with self.lock:
+                self.created_files.append(filename)
+
+        with self.organize_lock:
+            llm = self.file_organizer.llm_interface.llm
+            failures = llm.failures
+            self.file_organizer.organize_files()
+            if llm.failures != failures:
+                raise LLMFallbackError(
+                    "categorization fell back to keywords after an LLM failure"
+                )
+        return "organized"
+
+    def hr_query(self, rng):
+        response = self.llm_interface.process_hr_query(rng.choice(HR_QUERIES))
+        if response.startswith(HR_FALLBACK):
+            raise LLMFallbackError("HR query returned the fallback response")
+        return "answered"
+
+    def run_user(self, user_id, deadline):
+        rng = random.Random(self.args.seed * 100003 + user_id)
+        operations = list(OPERATIONS)
+        weights = list(OPERATIONS.values())
+        counter = 0
+
+        while counter < self.args.iterations and time.perf_counter() < deadline:
+            counter += 1
+            operation = rng.choices(operations, weights)[0]
+            start = time.perf_counter()
+            try:
+                if operation == "search":
+                    self.search(rng)
+                    outcome = None
+                elif operation == "book":
+                    outcome = self.book(rng)
+                elif operation == "organize":
+                    outcome = self.organize(rng, user_id, counter)
+                else:
+                    outcome = self.hr_query(rng)
+                self.record(operation, time.perf_counter() - start, outcome)
+            except Exception as e:
+                self.record(operation, time.perf_counter() - start, error=e)
+                print(f"User {user_id} {operation} failed: {e!r}")
+
+            if self.args.think_time:
+                time.sleep(rng.uniform(0, self.args.think_time))
+
+    def run(self):
+        start = time.perf_counter()
+        deadline = start + self.args.duration if self.args.duration else float("inf")
+
+        with ThreadPoolExecutor(max_workers=self.args.users) as executor:
+            futures = [
+                executor.submit(self.run_user, user_id, deadline)
+                for user_id in range(1, self.args.users + 1)
+            ]
+            for future in futures:
+                future.result()
+
+        return time.perf_counter() - start
+
+    def check_bookings(self):
+        problems = []
+
+        for employee, dates in self.scheduler.booked_slots.items():
+            for date_str, times in dates.items():
+                normalized = [
+                    "{:02d}:{:02d}".format(*map(int, t.split(":"))) for t in times
+                ]
+                if len(normalized) != len(set(normalized)):
+                    problems.append(f"double booking for {employee} on {date_str}")
+
+        reloaded = MeetingScheduler(
+            self.data["teams_file"], self.data["schedules_file"]
+        )
+        for participants, slot in self.bookings:
+            for participant in participants:
+                times = reloaded.booked_slots.get(participant, {}).get(slot["date"], [])
+                if slot["start_time"] not in times:
+                    problems.append(
+                        f"lost booking for {participant} at {slot['date']} {slot['start_time']}"
+                    )
+
+        return problems
+
+    def check_files(self):
+        present = set(os.listdir(self.data["sample_files_dir"]))
+        for category in os.listdir(self.data["categories_dir"]):
+            category_dir = os.path.join(self.data["categories_dir"], category)
+            if os.path.isdir(category_dir):
+                present.update(os.listdir(category_dir))
+
+        return [
+            f"lost file {name}" for name in self.created_files if name not in present
+        ]
+
+    def report(self, elapsed):
+        total_ops = sum(len(values) for values in self.latencies.values())
+        print()
+        print(
+            f"Users: {self.args.users}  Operations: {total_ops}  "
+            f"Elapsed: {elapsed:.2f}s  Throughput: {total_ops / elapsed:.1f} ops/s"
+        )
+        print(
+            f"{'operation':<10} {'count':>7} {'errors':>7} "
+            f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+        )
+        for operation in OPERATIONS:
+            values = self.latencies.get(operation, [])
+            print(
+                f"{operation:<10} {len(values):>7} {self.errors[operation]:>7} "
+                f"{percentile(values, 50) * 1000:>9.1f} "
+                f"{percentile(values, 95) * 1000:>9.1f} "
+                f"{percentile(values, 99) * 1000:>9.1f} "
+                f"{(max(values) if values else 0) * 1000:>9.1f}"
+            )
+
+        if self.outcomes:
+            print()
+            print("Outcomes:")
+            for key, count in sorted(self.outcomes.items()):
+                print(f"  {key}: {count}")
+
+        problems = self.check_bookings() + self.check_files()
+        print()
+        print(
+            f"Consistency: {len(self.bookings)} bookings, "
+            f"{len(self.created_files)} files created, {len(problems)} problems"
+        )
+        for problem in problems[:20]:
+            print(f"  ! {problem}")
+
+        return not problems and not any(self.errors.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulate concurrent users against the module APIs."
+    )
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument(
+        "--iterations", type=int, default=20, help="Operations per user"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=0, help="Stop after N seconds"
+    )
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--days", type=int, default=22)
+    parser.add_argument("--start-date", default="2025-04-01")
+    parser.add_argument("--search-days", type=int, default=5)
+    parser.add_argument("--files-per-batch", type=int, default=3)
+    parser.add_argument("--duplicate-rate", type=float, default=0.2)
+    parser.add_argument(
+        "--duplicate-action", default="skip", choices=["skip", "hardlink", "move"]
+    )
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--data-dir", help="Directory for synthetic data (default: temp)"
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep the data directory")
+    args = parser.parse_args()
+
+    temporary = args.data_dir is None
+    if temporary:
+        args.data_dir = tempfile.mkdtemp(prefix="companion-load-")
+
+    try:
+        load_test = LoadTest(args)
+        elapsed = load_test.run()
+        ok = load_test.report(elapsed)
+    finally:
+        if temporary and not args.keep:
+            shutil.rmtree(args.data_dir, ignore_errors=True)
+        else:
+            print(f"Data kept in {args.data_dir}")
+
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import re
+
+
+def estimate_tokens(text):
+    return (len(text.split()) * 4 + 2) // 3
+
+
+def first_sentence(text, max_words=25):
+    text = " ".join(text.split())
+    sentence = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0]
+    words = sentence.split()
+    if len(words) > max_words:
+        sentence = " ".join(words[:max_words]) + "..."
+    return sentence
+
+
+class ConversationMemory:
+    def __init__(self, max_turns=4, summary_token_budget=150):
+        self.max_turns = max_turns
+        self.summary_token_budget = summary_token_budget
+        self.turns = []
+        self.summary_lines = []
+
+    def add_turn(self, query, response):
+        self.turns.append({"user": query, "assistant": response})
+
+        while len(self.turns) > self.max_turns:
+            self.summarize_turn(self.turns.pop(0))
+
+    def summarize_turn(self, turn):
+        self.summary_lines.append(
+            f"User asked: {first_sentence(turn['user'])} "
+            f"Assistant: {first_sentence(turn['assistant'])}"
+        )
+
+        while len(self.summary_lines) > 1 and self.summary_tokens() > (
+            self.summary_token_budget
+        ):
+            self.summary_lines.pop(0)
+
+    def summary_tokens(self):
+        return sum(estimate_tokens(line) for line in self.summary_lines)
+
+    @property
+    def summary(self):
+        return "\n".join(self.summary_lines)
+
+    def to_prompt(self):
+        if not self.turns and not self.summary_lines:
+            return "No previous conversation."
+
+        sections = []
+        if self.summary_lines:
+            sections.append("Summary of earlier conversation:\n" + self.summary)
+        if self.turns:
+            sections.append(
+                "Recent conversation:\n"
+                + "\n".join(
+                    f"User: {turn['user']}\nAssistant: {turn['assistant']}"
+                    for turn in self.turns
+                )
+            )
+        return "\n\n".join(sections)
+
+    def clear(self):
+        self.turns = []
+        self.summary_lines = []
@@ -1,8 +1,25 @@
 import os
+import json
 import shutil
+import hashlib
+import tempfile
+import threading
 from modules.llm_interface import LLMInterface
+from modules.profiling import profile_methods
 
+DUPLICATE_ACTIONS = ("move", "hardlink", "skip")
+HASH_INDEX_FILE = ".file_hashes.json"
 
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@profile_methods(exclude=("get_file_hash",))
 class FileOrganizer:
     def __init__(
         self,
@@ -12,13 +29,25 @@ class FileOrganizer:
         categories_dir,
         model_kwargs,
         hugging_face_token,
+        duplicate_action="skip",
     ):
+        if duplicate_action not in DUPLICATE_ACTIONS:
+            raise ValueError(
+                f"duplicate_action must be one of {', '.join(DUPLICATE_ACTIONS)}"
+            )
+
         self.sample_files_dir = sample_files_dir
         self.categories_dir = categories_dir
+        self.duplicate_action = duplicate_action
         self.llm_interface = LLMInterface(
             repo_id, task, model_kwargs, hugging_face_token
         )
 
+        self.hash_index_path = os.path.join(categories_dir, HASH_INDEX_FILE)
+        self.hash_cache = self.load_hash_index()
+        self.duplicates = {}
+        self.lock = threading.Lock()
+
     def create_sample_files(self):
         for item in os.listdir(self.sample_files_dir):
             item_path = os.path.join(self.sample_files_dir, item)
@@ -52,12 +81,162 @@ class FileOrganizer:
             if os.path.isfile(os.path.join(self.sample_files_dir, f))
         ]
 
+    def load_hash_index(self):
+        try:
+            with open(self.hash_index_path, "r") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Error loading file hash index: {e}")
+            return {}
+
+        return {
+            os.path.abspath(os.path.join(self.categories_dir, path)): tuple(entry)
+            for path, entry in entries.items()
+        }
+
+    def save_hash_index(self):
+        self.hash_cache = {
+            path: entry
+            for path, entry in self.hash_cache.items()
+            if os.path.isfile(path)
+        }
+
+        categories_dir = os.path.abspath(self.categories_dir)
+        entries = {
+            os.path.relpath(path, categories_dir): entry
+            for path, entry in self.hash_cache.items()
+            if os.path.dirname(os.path.dirname(path)) == categories_dir
+        }
+
+        os.makedirs(self.categories_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.categories_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.hash_index_path)
+        except OSError as e:
+            print(f"Error saving file hash index: {e}")
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def get_file_hash(self, file_path):
+        stat = os.stat(file_path)
+        key = os.path.abspath(file_path)
+
+        entry = self.hash_cache.get(key)
+        if entry is None or entry[:2] != (stat.st_size, stat.st_mtime_ns):
+            entry = (stat.st_size, stat.st_mtime_ns, hash_file(file_path))
+            self.hash_cache[key] = entry
+
+        return entry[2]
+
+    def move_file(self, source, destination):
+        shutil.move(source, destination)
+
+        entry = self.hash_cache.pop(os.path.abspath(source), None)
+        if entry is not None:
+            self.hash_cache[os.path.abspath(destination)] = entry
+
+    def index_categorized_files(self):
+        index = {}
+        if not os.path.isdir(self.categories_dir):
+            return index
+
+        for category in sorted(os.listdir(self.categories_dir)):
+            category_dir = os.path.join(self.categories_dir, category)
+            if not os.path.isdir(category_dir):
+                continue
+
+            for filename in sorted(os.listdir(category_dir)):
+                file_path = os.path.join(category_dir, filename)
+                if os.path.isfile(file_path):
+                    index.setdefault(self.get_file_hash(file_path), file_path)
+
+        return index
+
+    def find_duplicates(self, files):
+        existing = self.index_categorized_files()
+        seen = {}
+        unique_files = []
+        duplicates = {}
+
+        for filename in files:
+            file_hash = self.get_file_hash(
+                os.path.join(self.sample_files_dir, filename)
+            )
+
+            if file_hash in existing:
+                duplicates[filename] = {
+                    "original": existing[file_hash],
+                    "category": os.path.basename(os.path.dirname(existing[file_hash])),
+                }
+            elif file_hash in seen:
+                duplicates[filename] = {"original": seen[file_hash], "category": None}
+            else:
+                seen[file_hash] = filename
+                unique_files.append(filename)
+
+        return unique_files, duplicates
+
+    def duplicate_destination(self, category, filename, original):
+        category_dir = os.path.join(self.categories_dir, category)
+        destination = os.path.join(category_dir, filename)
+        base, extension = os.path.splitext(filename)
+        counter = 1
+
+        while os.path.exists(destination):
+            if os.path.samefile(original, destination) or self.get_file_hash(
+                destination
+            ) == self.get_file_hash(original):
+                return destination
+            destination = os.path.join(category_dir, f"{base} ({counter}){extension}")
+            counter += 1
+
+        return destination
+
+    def place_duplicate(self, source, destination, original):
+        if self.duplicate_action == "hardlink":
+            if os.path.exists(destination):
+                if os.path.samefile(original, destination):
+                    os.unlink(source)
+                    return True
+                os.unlink(destination)
+
+            try:
+                os.link(original, destination)
+                os.unlink(source)
+                self.hash_cache.pop(os.path.abspath(source), None)
+                entry = self.hash_cache.get(os.path.abspath(original))
+                if entry is not None:
+                    self.hash_cache[os.path.abspath(destination)] = entry
+                return True
+            except OSError:
+                pass
+
+        self.move_file(source, destination)
+        return True
+
     def organize_files(self):
+        with self.lock:
+            try:
+                return self._organize_files()
+            finally:
+                self.save_hash_index()
+
+    def _organize_files(self):
+        self.duplicates = {}
         files = self.list_files()
         if not files:
             return None
 
-        categories = self.llm_interface.categorize_files(files)
+        unique_files, duplicates = self.find_duplicates(files)
+        self.duplicates = duplicates
+
+        categories = (
+            self.llm_interface.categorize_files(unique_files) if unique_files else {}
+        )
 
         for category in set(categories.values()):
             category_dir = os.path.join(self.categories_dir, category.lower())
@@ -73,7 +252,31 @@ class FileOrganizer:
             destination = os.path.join(self.categories_dir, category, filename)
 
             if os.path.exists(source):
-                shutil.move(source, destination)
+                self.move_file(source, destination)
                 results[category].append(filename)
 
+        for filename, duplicate in duplicates.items():
+            original = duplicate["original"]
+            if duplicate["category"] is None:
+                category = categories.get(original)
+                if category is None:
+                    continue
+                category = category.lower()
+                duplicate["category"] = category
+                original = os.path.join(self.categories_dir, category, original)
+                duplicate["original"] = original
+
+            if self.duplicate_action == "skip":
+                continue
+
+            category = duplicate["category"]
+            source = os.path.join(self.sample_files_dir, filename)
+
+            if os.path.exists(source):
+                os.makedirs(os.path.join(self.categories_dir, category), exist_ok=True)
+                destination = self.duplicate_destination(category, filename, original)
+                duplicate["destination"] = destination
+                self.place_duplicate(source, destination, original)
+                results.setdefault(category, []).append(os.path.basename(destination))
+
         return results
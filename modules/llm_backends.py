@@ -0,0 +1,112 @@
+import json
+import time
+import random
+from typing import Any, Dict, List, Optional
+from langchain_community.llms.huggingface_hub import HuggingFaceHub
+from langchain_core.language_models.llms import LLM
+from langchain.chains import LLMChain
+from langchain_core.prompts import PromptTemplate
+from langchain.output_parsers import PydanticOutputParser
+from pydantic import BaseModel, Field
+from modules.llm_interface import categorize_by_keywords
+
+
+class FileCategories(BaseModel):
+    categories: Dict[str, str] = Field(
+        ..., description="Dictionary mapping filenames to categories"
+    )
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "categories": {
+                        "expense_report_march.pdf": "Finance",
+                        "tax_documentation.pdf": "Finance",
+                        "employee_policy.docx": "HR",
+                    }
+                }
+            ]
+        }
+    }
+
+
+class MeetingSlot(BaseModel):
+    date: str = Field(description="Date of the meeting in YYYY-MM-DD format")
+    start_time: str = Field(description="Start time in HH:MM format")
+    end_time: str = Field(description="End time in HH:MM format")
+    duration: float = Field(description="Duration of the meeting in hours")
+    participants: List[str] = Field(description="List of meeting participants")
+
+
+class HRPolicies(BaseModel):
+    title: str = Field(description="Title of the policy")
+    description: str = Field(description="Description of the policy")
+    details: Optional[str] = Field(description="Additional details or clarifications")
+
+
+SAMPLE_FILE_CATEGORIES = {
+    "quarterly_report_Q1.pdf": "Finance",
+    "balance_sheet.xlsx": "Finance",
+    "annual_budget_2025.xlsx": "Finance",
+    "expense_report_march.pdf": "Finance",
+    "tax_documentation.pdf": "Finance",
+    "employee_policy.docx": "HR",
+    "leave_form.pdf": "HR",
+    "onboarding_checklist.docx": "HR",
+    "performance_review_template.docx": "HR",
+    "benefits_overview.pdf": "HR",
+}
+
+
+class MockLLMError(RuntimeError):
+    pass
+
+
+class MockLLM(LLM):
+    latency: float = 0.0
+    failure_rate: float = 0.0
+    failures: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock_llm"
+
+    @staticmethod
+    def prompt_files(prompt: str) -> List[str]:
+        if "Files:" not in prompt:
+            return []
+
+        section = prompt.split("Files:", 1)[1].split("Categorize each file", 1)[0]
+        return [line.strip() for line in section.splitlines() if line.strip()]
+
+    def _call(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            self.failures += 1
+            raise MockLLMError("Simulated LLM failure")
+
+        if "categorize" in prompt.lower() and "files" in prompt.lower():
+            files = self.prompt_files(prompt)
+            if not files:
+                return json.dumps({"categories": SAMPLE_FILE_CATEGORIES})
+
+            categories = categorize_by_keywords(files)
+            categories.update(
+                {
+                    f: SAMPLE_FILE_CATEGORIES[f]
+                    for f in files
+                    if f in SAMPLE_FILE_CATEGORIES
+                }
+            )
+            return json.dumps({"categories": categories})
+        elif "HR" in prompt and "query" in prompt:
+            return "Based on our company policies, employees are entitled to 20 days of paid leave annually. These days are accrued on a monthly basis. For more details, please consult the employee handbook or contact the HR department directly."
+        else:
+            return "I've processed your request, here's my response."
@@ -1,95 +1,97 @@
 import json
-from typing import Dict, List, Optional
-from langchain_community.llms.huggingface_hub import HuggingFaceHub
-from langchain_core.language_models.llms import LLM
-from langchain.chains import LLMChain
-from langchain_core.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
-from pydantic import BaseModel, Field
-
-
-class FileCategories(BaseModel):
-    categories: Dict[str, str] = Field(
-        ..., description="Dictionary mapping filenames to categories"
-    )
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "categories": {
-                        "expense_report_march.pdf": "Finance",
-                        "tax_documentation.pdf": "Finance",
-                        "employee_policy.docx": "HR",
-                    }
-                }
-            ]
-        }
-    }
+from modules.profiling import profile_methods
 
+BACKEND_EXPORTS = ("FileCategories", "MeetingSlot", "HRPolicies", "MockLLM")
 
-class MeetingSlot(BaseModel):
-    date: str = Field(description="Date of the meeting in YYYY-MM-DD format")
-    start_time: str = Field(description="Start time in HH:MM format")
-    end_time: str = Field(description="End time in HH:MM format")
-    duration: float = Field(description="Duration of the meeting in hours")
-    participants: List[str] = Field(description="List of meeting participants")
 
+def __getattr__(name):
+    if name in BACKEND_EXPORTS:
+        from modules import llm_backends
 
-class HRPolicies(BaseModel):
-    title: str = Field(description="Title of the policy")
-    description: str = Field(description="Description of the policy")
-    details: Optional[str] = Field(description="Additional details or clarifications")
+        return getattr(llm_backends, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-class MockLLM(LLM):
-    @property
-    def _llm_type(self) -> str:
-        return "mock_llm"
-
-    def _call(
-        self,
-        prompt: str,
-    ) -> str:
-        if "categorize" in prompt.lower() and "files" in prompt.lower():
-            return """
-            {
-                "categories": {
-                    "quarterly_report_Q1.pdf": "Finance",
-                    "balance_sheet.xlsx": "Finance",
-                    "annual_budget_2025.xlsx": "Finance",
-                    "expense_report_march.pdf": "Finance",
-                    "tax_documentation.pdf": "Finance",
-                    "employee_policy.docx": "HR",
-                    "leave_form.pdf": "HR",
-                    "onboarding_checklist.docx": "HR",
-                    "performance_review_template.docx": "HR",
-                    "benefits_overview.pdf": "HR"
-                }
-            }
-            """
-        elif "HR" in prompt and "query" in prompt:
-            return "Based on our company policies, employees are entitled to 20 days of paid leave annually. These days are accrued on a monthly basis. For more details, please consult the employee handbook or contact the HR department directly."
+def categorize_by_keywords(files):
+    categories = {}
+    for file in files:
+        lower_file = file.lower()
+        if any(
+            term in lower_file
+            for term in [
+                "budget",
+                "finance",
+                "report",
+                "tax",
+                "expense",
+                "balance",
+            ]
+        ):
+            categories[file] = "finance"
+        elif any(
+            term in lower_file
+            for term in [
+                "hr",
+                "employee",
+                "leave",
+                "onboarding",
+                "review",
+                "benefit",
+            ]
+        ):
+            categories[file] = "hr"
         else:
-            return "I've processed your request, here's my response."
+            categories[file] = "other"
 
+    return categories
 
+
+@profile_methods
 class LLMInterface:
     def __init__(self, repo_id, task, model_kwargs, hugging_face_token):
+        self.repo_id = repo_id
+        self.task = task
+        self.model_kwargs = model_kwargs
+        self.hugging_face_token = hugging_face_token
+        self._llm = None
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            self._llm = self.create_llm()
+        return self._llm
+
+    @llm.setter
+    def llm(self, llm):
+        self._llm = llm
+
+    def create_llm(self):
+        from modules.llm_backends import HuggingFaceHub, MockLLM
+
         try:
-            self.llm = HuggingFaceHub(
-                repo_id=repo_id,
-                model_kwargs=model_kwargs,
-                huggingfacehub_api_token=hugging_face_token,
+            llm = HuggingFaceHub(
+                repo_id=self.repo_id,
+                model_kwargs=self.model_kwargs,
+                huggingfacehub_api_token=self.hugging_face_token,
                 verbose=False,
-                task=task,
+                task=self.task,
             )
             print("Real llm initialized")
         except Exception as e:
             print(f"Error initializing LlamaCpp: {e}")
-            self.llm = MockLLM()
+            llm = MockLLM()
             print("mock llm initialized")
 
+        return llm
+
     def categorize_files(self, files):
+        from modules.llm_backends import (
+            FileCategories,
+            LLMChain,
+            PromptTemplate,
+            PydanticOutputParser,
+        )
+
         template = """
         You are an expert file organizer. Your task is to categorize the following files into logical groups.
         
@@ -121,39 +123,11 @@ class LLMInterface:
         except Exception as e:
             print(f"Error parsing LLM output: {e}")
 
-            categories = {}
-            for file in files:
-                lower_file = file.lower()
-                if any(
-                    term in lower_file
-                    for term in [
-                        "budget",
-                        "finance",
-                        "report",
-                        "tax",
-                        "expense",
-                        "balance",
-                    ]
-                ):
-                    categories[file] = "finance"
-                elif any(
-                    term in lower_file
-                    for term in [
-                        "hr",
-                        "employee",
-                        "leave",
-                        "onboarding",
-                        "review",
-                        "benefit",
-                    ]
-                ):
-                    categories[file] = "hr"
-                else:
-                    categories[file] = "other"
-
-            return categories
-
-    def process_hr_query(self, query):
+            return categorize_by_keywords(files)
+
+    def process_hr_query(self, query, memory=None):
+        from modules.llm_backends import LLMChain, PromptTemplate
+
         hr_policies = {
             "leave": "Employees are entitled to 20 days of paid leave annually, accrued monthly.",
             "remote_work": "Remote work is available for eligible employees up to 2 days per week.",
@@ -171,6 +145,10 @@ class LLMInterface:
 
         template = """
         You are a knowledgeable HR assistant. Answer the following query based on company policies and upcoming events.
+        Use the conversation so far to resolve follow-up questions.
+        
+        Conversation so far:
+        {history}
         
         Query: {query}
         
@@ -187,6 +165,9 @@ class LLMInterface:
             template=template,
             input_variables=["query"],
             partial_variables={
+                "history": (
+                    memory.to_prompt() if memory else "No previous conversation."
+                ),
                 "policies": json.dumps(hr_policies, indent=2),
                 "events": json.dumps(events, indent=2),
             },
@@ -195,8 +176,11 @@ class LLMInterface:
         chain = LLMChain(llm=self.llm, prompt=prompt)
 
         try:
-            result = chain.run(query=query)
-            return result.strip()
+            result = chain.run(query=query).strip()
         except Exception as e:
             print(f"Error processing HR query: {e}")
             return "I'm sorry, I couldn't process your query. Please try again with a different question about HR policies or company events."
+
+        if memory is not None:
+            memory.add_turn(query, result)
+        return result
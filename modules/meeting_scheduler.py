@@ -1,28 +1,50 @@
-import pandas as pd
+import os
+import csv
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta, time
 from typing import List, Dict, Any
-from pydantic import BaseModel, Field
+from modules.profiling import profile_methods
+from modules.schedule_snapshot import (
+    ScheduleSnapshot,
+    build_masks,
+    snapshot_path,
+    source_signature,
+    write_snapshot,
+)
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
-class MeetingSlot(BaseModel):
-    date: str = Field(description="Date of the meeting in YYYY-MM-DD format")
-    start_time: str = Field(description="Start time in HH:MM format")
-    end_time: str = Field(description="End time in HH:MM format")
-    duration: float = Field(description="Duration of the meeting in hours")
-    participants: List[str] = Field(description="List of meeting participants")
 
+def __getattr__(name):
+    if name == "MeetingSlot":
+        from modules.llm_backends import MeetingSlot
 
+        return MeetingSlot
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@profile_methods(exclude=("is_available",))
 class MeetingScheduler:
     def __init__(
         self, teams_file="employee_teams.csv", schedules_file="employee_schedules.csv"
     ):
         self.teams_file = teams_file
         self.schedules_file = schedules_file
+        self.snapshot_file = snapshot_path(schedules_file)
+        self.lock_file = f"{schedules_file}.lock"
+        self.lock = threading.RLock()
+        self.file_lock_depth = 0
+        self.file_lock_handle = None
 
-        self.employee_teams = pd.read_csv(self.teams_file)
+        with open(self.teams_file, newline="") as f:
+            self.employee_teams = list(csv.DictReader(f))
 
-        self.employee_schedules = pd.read_csv(self.schedules_file, index_col=0)
-        self.process_schedules()
+        self.load_schedules()
 
         self.work_start = time(9, 0)
         self.work_end = time(18, 0)
@@ -31,7 +53,48 @@ class MeetingScheduler:
 
         self.work_days = [0, 1, 2, 3, 4]
 
+    def load_schedules(self):
+        with self._file_lock():
+            signature = source_signature(self.schedules_file)
+
+            if not self.load_snapshot():
+                import pandas as pd
+
+                self.employee_schedules = pd.read_csv(self.schedules_file, index_col=0)
+                self.schedule_dates = list(self.employee_schedules.columns)
+                self.process_schedules()
+                self.write_snapshot(signature)
+
+            self.loaded_signature = signature
+
+    def refresh(self):
+        with self.lock:
+            if source_signature(self.schedules_file) == self.loaded_signature:
+                return False
+
+            self.load_schedules()
+            return True
+
+    @contextmanager
+    def _file_lock(self):
+        with self.lock:
+            if self.file_lock_depth == 0 and fcntl is not None:
+                self.file_lock_handle = open(self.lock_file, "a")
+                fcntl.flock(self.file_lock_handle.fileno(), fcntl.LOCK_EX)
+            self.file_lock_depth += 1
+
+            try:
+                yield
+            finally:
+                self.file_lock_depth -= 1
+                if self.file_lock_depth == 0 and self.file_lock_handle is not None:
+                    fcntl.flock(self.file_lock_handle.fileno(), fcntl.LOCK_UN)
+                    self.file_lock_handle.close()
+                    self.file_lock_handle = None
+
     def process_schedules(self):
+        import pandas as pd
+
         self.booked_slots = {}
 
         for employee, row in self.employee_schedules.iterrows():
@@ -40,19 +103,104 @@ class MeetingScheduler:
             for date_col in self.employee_schedules.columns:
                 if pd.notna(row[date_col]):
                     time_slots = row[date_col].split(",")
-                    time_slots = [slot.strip() for slot in time_slots]
+                    time_slots = [
+                        self.normalize_time(slot) for slot in time_slots if slot.strip()
+                    ]
 
                     self.booked_slots[employee][date_col] = time_slots
 
+    @staticmethod
+    def normalize_time(time_str):
+        time_str = time_str.strip()
+        try:
+            hour, minute = map(int, time_str.split(":"))
+        except ValueError:
+            return time_str
+        return f"{hour:02d}:{minute:02d}"
+
+    def load_snapshot(self):
+        try:
+            snapshot = ScheduleSnapshot.load(self.snapshot_file, self.schedules_file)
+        except OSError as e:
+            print(f"Error loading schedule snapshot: {e}")
+            return False
+
+        if snapshot is None:
+            return False
+
+        try:
+            self.schedule_dates = snapshot.dates
+            self.booked_slots = snapshot.booked_slots()
+        finally:
+            snapshot.close()
+
+        return True
+
+    def write_snapshot(self, signature=None):
+        employees = list(self.booked_slots)
+        masks = build_masks(self.booked_slots, employees, self.schedule_dates)
+
+        try:
+            if masks is None:
+                if os.path.exists(self.snapshot_file):
+                    os.unlink(self.snapshot_file)
+                return False
+
+            written = write_snapshot(
+                self.snapshot_file,
+                self.schedules_file,
+                employees,
+                self.schedule_dates,
+                masks,
+                signature,
+            )
+        except OSError as e:
+            print(f"Error writing schedule snapshot: {e}")
+            return False
+
+        return written is not None
+
     def get_all_employees(self) -> List[str]:
-        return sorted(self.employee_teams["Employee"].tolist())
+        return sorted(row["Employee"] for row in self.employee_teams)
 
     def get_all_teams(self) -> List[str]:
-        return sorted(self.employee_teams["Team"].unique().tolist())
+        return sorted({row["Team"] for row in self.employee_teams})
 
     def get_team_members(self, team_name: str) -> List[str]:
-        team_df = self.employee_teams[self.employee_teams["Team"] == team_name]
-        return team_df["Employee"].tolist()
+        return [
+            row["Employee"] for row in self.employee_teams if row["Team"] == team_name
+        ]
+
+    def expand_participants(self, participants: List[str]) -> List[str]:
+        teams = self.get_all_teams()
+        expanded_participants = []
+        for p in participants:
+            if p in teams:
+                expanded_participants.extend(self.get_team_members(p))
+            else:
+                expanded_participants.append(p)
+
+        return list(set(expanded_participants))
+
+    def slot_hours(self, slot: Dict[str, Any]):
+        try:
+            slot_date = datetime.strptime(slot["date"], "%Y-%m-%d").date()
+            start = datetime.strptime(slot["start_time"], "%H:%M").time()
+            end = datetime.strptime(slot["end_time"], "%H:%M").time()
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        if slot_date.weekday() not in self.work_days:
+            return None
+        if start.minute or end.minute:
+            return None
+        if not self.work_start <= start < end <= self.work_end:
+            return None
+
+        hours = range(start.hour, end.hour)
+        if any(self.lunch_start <= time(hour, 0) < self.lunch_end for hour in hours):
+            return None
+        return hours
 
     def is_available(self, employee: str, date_str: str, time_str: str) -> bool:
         hour, minute = map(int, time_str.split(":"))
@@ -92,14 +240,9 @@ class MeetingScheduler:
         if not participants:
             return []
 
-        expanded_participants = []
-        for p in participants:
-            if p in self.get_all_teams():
-                expanded_participants.extend(self.get_team_members(p))
-            else:
-                expanded_participants.append(p)
+        self.refresh()
 
-        participants = list(set(expanded_participants))
+        participants = self.expand_participants(participants)
 
         if start_date is None:
             start_date = datetime.now().date()
@@ -170,28 +313,50 @@ class MeetingScheduler:
         except ValueError:
             return False
 
-        date_str = slot["date"]
-        current_dt = start_dt
+        with self._file_lock():
+            self.refresh()
 
-        while current_dt < end_dt:
-            time_str = current_dt.strftime("%H:%M")
+            date_str = slot["date"]
+            current_dt = start_dt
 
-            for participant in participants:
-                if participant not in self.booked_slots:
-                    self.booked_slots[participant] = {}
+            while current_dt < end_dt:
+                time_str = current_dt.strftime("%H:%M")
 
-                if date_str not in self.booked_slots[participant]:
-                    self.booked_slots[participant][date_str] = []
+                for participant in participants:
+                    if participant not in self.booked_slots:
+                        self.booked_slots[participant] = {}
 
-                self.booked_slots[participant][date_str].append(time_str)
+                    if date_str not in self.booked_slots[participant]:
+                        self.booked_slots[participant][date_str] = []
 
-            current_dt += timedelta(hours=1)
+                    self.booked_slots[participant][date_str].append(time_str)
 
-        self.save_schedules()
+                current_dt += timedelta(hours=1)
+
+            self.save_schedules()
 
         return True
 
+    def book_if_available(self, participants: List[str], slot: Dict[str, Any]) -> bool:
+        hours = self.slot_hours(slot)
+        if hours is None or not participants:
+            return False
+
+        participants = self.expand_participants(participants)
+
+        with self._file_lock():
+            self.refresh()
+
+            for p in participants:
+                for hour in hours:
+                    if not self.is_available(p, slot["date"], f"{hour:02d}:00"):
+                        return False
+
+            return self.book_meeting(participants, slot)
+
     def save_schedules(self):
+        import pandas as pd
+
         new_data = {}
 
         for employee, dates in self.booked_slots.items():
@@ -202,12 +367,29 @@ class MeetingScheduler:
 
         result_df = pd.DataFrame.from_dict(new_data, orient="index")
 
-        for col in self.employee_schedules.columns:
+        for col in self.schedule_dates:
             if col not in result_df.columns:
                 result_df[col] = ""
 
-        result_df = result_df[self.employee_schedules.columns]
+        result_df = result_df[self.schedule_dates]
 
-        result_df.to_csv(self.schedules_file)
+        with self._file_lock():
+            fd, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.schedules_file)),
+                suffix=".tmp",
+            )
+            try:
+                with os.fdopen(fd, "w", newline="") as f:
+                    result_df.to_csv(f)
+                if os.path.exists(self.schedules_file):
+                    os.chmod(temp_path, os.stat(self.schedules_file).st_mode & 0o777)
+                os.replace(temp_path, self.schedules_file)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+
+            self.loaded_signature = source_signature(self.schedules_file)
+            self.write_snapshot(self.loaded_signature)
 
         return True
@@ -0,0 +1,217 @@
+import os
+import json
+import time
+import types
+import threading
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_MODES = ("timers", "cprofile", "tracemalloc")
+DEFAULT_MODES = ("timers", "cprofile")
+
+
+def parse_modes(value):
+    if not value or value.strip().lower() in ("0", "false", "off", "no"):
+        return set()
+    if value.strip().lower() in ("1", "true", "on", "yes"):
+        return set(DEFAULT_MODES)
+
+    modes = {mode.strip().lower() for mode in value.split(",") if mode.strip()}
+    unknown = modes - set(PROFILE_MODES)
+    if unknown:
+        raise ValueError(
+            f"Unknown profile modes: {', '.join(sorted(unknown))} "
+            f"(expected any of {', '.join(PROFILE_MODES)})"
+        )
+    return modes
+
+
+class ProfileRequest:
+    tracemalloc_lock = threading.Lock()
+    tracemalloc_users = 0
+    tracemalloc_owned = False
+
+    def __init__(self, name, modes):
+        self.name = name
+        self.modes = modes
+        self.started = time.perf_counter()
+        self.calls = []
+        self.cprofile = None
+        self.tracing = False
+
+        if "cprofile" in modes:
+            import cProfile
+
+            self.cprofile = cProfile.Profile()
+            try:
+                self.cprofile.enable()
+            except ValueError:
+                self.cprofile = None
+
+        if "tracemalloc" in modes:
+            import tracemalloc
+
+            with ProfileRequest.tracemalloc_lock:
+                if (
+                    ProfileRequest.tracemalloc_users == 0
+                    and not tracemalloc.is_tracing()
+                ):
+                    tracemalloc.start()
+                    ProfileRequest.tracemalloc_owned = True
+                ProfileRequest.tracemalloc_users += 1
+            self.tracing = True
+
+    def stop(self):
+        if self.cprofile is not None:
+            self.cprofile.disable()
+
+        snapshot = None
+        if self.tracing:
+            import tracemalloc
+
+            self.tracing = False
+            with ProfileRequest.tracemalloc_lock:
+                if tracemalloc.is_tracing():
+                    snapshot = tracemalloc.take_snapshot()
+                ProfileRequest.tracemalloc_users -= 1
+                if (
+                    ProfileRequest.tracemalloc_users == 0
+                    and ProfileRequest.tracemalloc_owned
+                ):
+                    tracemalloc.stop()
+                    ProfileRequest.tracemalloc_owned = False
+
+        return time.perf_counter() - self.started, snapshot
+
+
+class Profiler:
+    def __init__(self, profile_dir="data/profiles", modes=()):
+        self.profile_dir = profile_dir
+        self.modes = set(modes)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.stats = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.getenv("PROFILE_DIR", "data/profiles"),
+            parse_modes(os.getenv("PROFILE", "")),
+        )
+
+    @property
+    def enabled(self):
+        return bool(self.modes)
+
+    def configure(self, modes=None, profile_dir=None):
+        if modes is not None:
+            self.modes = parse_modes(modes) if isinstance(modes, str) else set(modes)
+        if profile_dir is not None:
+            self.profile_dir = profile_dir
+
+    def record(self, name, elapsed):
+        with self.lock:
+            entry = self.stats.setdefault(
+                name, {"calls": 0, "total_s": 0.0, "max_s": 0.0}
+            )
+            entry["calls"] += 1
+            entry["total_s"] += elapsed
+            entry["max_s"] = max(entry["max_s"], elapsed)
+
+        request = getattr(self.local, "request", None)
+        if request is not None:
+            request.calls.append({"method": name, "elapsed_s": elapsed})
+
+    def summary(self):
+        with self.lock:
+            return {
+                name: {**entry, "mean_s": entry["total_s"] / entry["calls"]}
+                for name, entry in sorted(
+                    self.stats.items(), key=lambda item: -item[1]["total_s"]
+                )
+            }
+
+    def start_request(self, name):
+        self.discard_request()
+        if not self.enabled:
+            return None
+
+        request = ProfileRequest(name, set(self.modes))
+        self.local.request = request
+        return request
+
+    def discard_request(self):
+        request = getattr(self.local, "request", None)
+        if request is not None:
+            request.stop()
+            self.local.request = None
+
+    def finish_request(self, request):
+        if request is None or getattr(self.local, "request", None) is not request:
+            return None
+
+        self.local.request = None
+        elapsed, snapshot = request.stop()
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        base = os.path.join(self.profile_dir, f"{request.name}_{stamp}")
+
+        if request.cprofile is not None:
+            request.cprofile.dump_stats(f"{base}.prof")
+        if snapshot is not None:
+            snapshot.dump(f"{base}.tracemalloc")
+        if "timers" in request.modes:
+            with open(f"{base}_timers.json", "w") as f:
+                json.dump(
+                    {
+                        "request": request.name,
+                        "elapsed_s": elapsed,
+                        "calls": request.calls,
+                    },
+                    f,
+                    indent=4,
+                )
+            with open(os.path.join(self.profile_dir, "timers_summary.json"), "w") as f:
+                json.dump(self.summary(), f, indent=4)
+
+        return base
+
+    @contextmanager
+    def profile_request(self, name):
+        request = self.start_request(name)
+        try:
+            yield request
+        finally:
+            self.finish_request(request)
+
+
+profiler = Profiler.from_env()
+
+
+def timed(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not profiler.modes:
+            return func(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.record(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+def profile_methods(cls=None, exclude=()):
+    def decorate(cls):
+        for name, attr in list(vars(cls).items()):
+            if name.startswith("_") or name in exclude:
+                continue
+            if isinstance(attr, types.FunctionType):
+                setattr(cls, name, timed(f"{cls.__name__}.{name}", attr))
+        return cls
+
+    return decorate(cls) if cls is not None else decorate
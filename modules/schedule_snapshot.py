@@ -0,0 +1,129 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import tempfile
+from functools import lru_cache
+
+MAGIC = b"CCSNAP01"
+HEADER = struct.Struct("<8sQqIII")
+
+
+def snapshot_path(schedules_file):
+    return f"{schedules_file}.snap"
+
+
+def source_signature(source_file):
+    stat = os.stat(source_file)
+    return stat.st_size, stat.st_mtime_ns
+
+
+@lru_cache(maxsize=None)
+def mask_to_times(mask):
+    return tuple(f"{hour:02d}:00" for hour in range(24) if mask >> hour & 1)
+
+
+def build_masks(booked_slots, employees, dates):
+    masks = []
+    for employee in employees:
+        employee_slots = booked_slots.get(employee, {})
+        for date_str in dates:
+            mask = 0
+            for time_str in employee_slots.get(date_str, ()):
+                try:
+                    hour, minute = map(int, time_str.split(":"))
+                except ValueError:
+                    return None
+                if minute != 0 or not 0 <= hour < 24:
+                    return None
+                mask |= 1 << hour
+            masks.append(mask)
+    return masks
+
+
+def write_snapshot(path, source_file, employees, dates, masks, signature=None):
+    index = json.dumps({"employees": employees, "dates": dates}).encode("utf-8")
+    padding = b"\0" * (-(HEADER.size + len(index)) % 4)
+    size, mtime_ns = signature or source_signature(source_file)
+
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(
+                HEADER.pack(
+                    MAGIC, size, mtime_ns, len(employees), len(dates), len(index)
+                )
+            )
+            f.write(index)
+            f.write(padding)
+            f.write(struct.pack(f"<{len(masks)}I", *masks))
+        if source_signature(source_file) != (size, mtime_ns):
+            os.remove(temp_path)
+            return None
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return path
+
+
+class ScheduleSnapshot:
+    def __init__(self, employees, dates, mapped, offset):
+        self.employees = employees
+        self.dates = dates
+        self.mapped = mapped
+        self.masks = memoryview(mapped)[offset:].cast("I")
+
+    @classmethod
+    def load(cls, path, source_file):
+        if sys.byteorder != "little" or not os.path.exists(path):
+            return None
+
+        with open(path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return None
+
+        try:
+            magic, size, mtime_ns, n_employees, n_dates, index_len = HEADER.unpack_from(
+                mapped
+            )
+            if magic != MAGIC or (size, mtime_ns) != source_signature(source_file):
+                mapped.close()
+                return None
+
+            index = json.loads(mapped[HEADER.size : HEADER.size + index_len])
+            offset = HEADER.size + index_len
+            offset += -offset % 4
+            if len(mapped) - offset != n_employees * n_dates * 4:
+                mapped.close()
+                return None
+        except (struct.error, ValueError):
+            mapped.close()
+            return None
+
+        return cls(index["employees"], index["dates"], mapped, offset)
+
+    def booked_slots(self):
+        booked_slots = {}
+        n_dates = len(self.dates)
+
+        for row, employee in enumerate(self.employees):
+            row_masks = self.masks[row * n_dates : (row + 1) * n_dates]
+            booked_slots[employee] = {
+                date_str: list(mask_to_times(mask))
+                for date_str, mask in zip(self.dates, row_masks)
+                if mask
+            }
+
+        return booked_slots
+
+    def close(self):
+        self.masks.release()
+        self.mapped.close()
@@ -1,70 +1,305 @@
 import os
+import csv
 import json
 import re
-import phonenumbers
-from email_validator import validate_email, EmailNotValidError
+import glob
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from modules.profiling import profile_methods
+from modules.user_store import UserStore
+from modules.utils import (
+    sanitize_text,
+    parse_phone,
+    check_email,
+    check_email_syntax,
+    normalize_phone,
+    tokenize_text,
+)
 
+NAME_PATTERN = re.compile(r"^[A-Za-z\s\-'\.]{2,50}$")
+IMPORT_FIELDS = [
+    "employee_id",
+    "name",
+    "email",
+    "phone",
+    "department",
+    "office_location",
+]
 
-class UserManager:
-    def __init__(self, data_dir):
-        self.data_dir = data_dir
 
-    def validate_user_info(self, name, email, phone):
-        errors = {"name": "", "email": "", "phone": ""}
-        is_valid = True
+def validate_fields(name, email, phone, check_deliverability=True):
+    errors = {"name": "", "email": "", "phone": ""}
+    is_valid = True
+
+    if name and not NAME_PATTERN.match(name):
+        errors["name"] = (
+            "Name should contain only letters, spaces, hyphens, apostrophes, and periods (2-50 chars)."
+        )
+        is_valid = False
 
-        if name and not re.match(r"^[A-Za-z\s\-'\.]{2,50}$", name):
-            errors["name"] = (
-                "Name should contain only letters, spaces, hyphens, apostrophes, and periods (2-50 chars)."
-            )
+    if email:
+        errors["email"] = (
+            check_email(email) if check_deliverability else check_email_syntax(email)
+        )
+        if errors["email"]:
             is_valid = False
 
-        if email:
-            try:
-                validate_email(email)
-            except EmailNotValidError as e:
-                errors["email"] = str(e)
-                is_valid = False
+    if phone and parse_phone(phone) is None:
+        errors["phone"] = "Invalid phone number format."
+        is_valid = False
 
-        if phone:
-            try:
-                parsed_number = phonenumbers.parse(phone, "IN")
-                if not phonenumbers.is_valid_number(parsed_number):
-                    errors["phone"] = "Invalid phone number format."
-                    is_valid = False
-            except Exception:
-                errors["phone"] = "Invalid phone number format."
-                is_valid = False
+    return {"valid": is_valid, "errors": errors}
 
-        return {"valid": is_valid, "errors": errors}
 
-    def save_user_data(self, user_data):
-        identifier = user_data.get("employee_id")
-        file_path = os.path.join(self.data_dir, f"{identifier}.json")
+def build_user_record(row):
+    employee_id = (row.get("employee_id") or "").strip()
+    name = row.get("name") or ""
+    email = row.get("email") or ""
+    phone = row.get("phone") or ""
+
+    validation_results = validate_fields(name, email, phone, check_deliverability=False)
+    if not employee_id:
+        validation_results["valid"] = False
+        validation_results["errors"]["employee_id"] = "Employee ID is required"
+
+    if not validation_results["valid"]:
+        errors = {k: v for k, v in validation_results["errors"].items() if v}
+        return None, errors
+
+    user_data = {
+        "name": sanitize_text(name, default="Anonymous User"),
+        "email": sanitize_text(email),
+        "phone": normalize_phone(phone),
+        "department": sanitize_text(row.get("department")),
+        "employee_id": employee_id,
+        "office_location": sanitize_text(row.get("office_location")),
+        "has_resume": False,
+    }
+    return user_data, {}
+
+
+def read_import_file(file_path):
+    rows = []
+    errors = []
+
+    with open(file_path, "r", newline="", encoding="utf-8-sig") as f:
+        if file_path.lower().endswith((".jsonl", ".ndjson")):
+            for row_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    errors.append({"row": row_number, "errors": {"row": str(e)}})
+                    continue
 
-        with open(file_path, "w") as f:
-            json.dump(user_data, f, indent=4)
+                if not isinstance(row, dict):
+                    errors.append(
+                        {"row": row_number, "errors": {"row": "Expected a JSON object"}}
+                    )
+                    continue
+
+                rows.append((row_number, row))
+        else:
+            rows = list(enumerate(csv.DictReader(f), start=1))
+
+    return rows, errors
+
+
+def extract_resume_text(file_path):
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(file_path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+@profile_methods
+class UserManager:
+    def __init__(self, data_dir, db_file="users.db", resume_retention=3):
+        self.data_dir = data_dir
+        self.resume_dir = os.path.join(data_dir, "resumes")
+        self.resume_retention = resume_retention
+        self.store = UserStore(os.path.join(data_dir, db_file))
+        self.store.migrate_json_files(data_dir)
+        self.resume_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="resume-index"
+        )
+        if not self.store.get_meta("resumes_indexed"):
+            self.resume_executor.submit(self.backfill_resume_index)
+
+    def validate_user_info(self, name, email, phone):
+        return validate_fields(name, email, phone)
+
+    def save_user_data(self, user_data):
+        self.store.save(user_data)
 
         return True
 
     def get_user_data(self, user_identifier):
-        user_file = f"{user_identifier}.json"
-        file_path = os.path.join(self.data_dir, user_file)
+        return self.store.get(user_identifier)
 
-        if os.path.exists(file_path):
-            with open(file_path, "r") as f:
-                return json.load(f)
+    def find_user_by_email(self, email):
+        users = self.store.find_by_email(email)
+        return users[0] if users else None
 
-        return None
+    def find_user_by_phone(self, phone):
+        phone = normalize_phone(phone)
+        if phone == "Invalid number":
+            return None
 
-    def save_resume(self, resume_file, employee_id):
+        users = self.store.find_by_phone(phone)
+        return users[0] if users else None
+
+    def find_users_by_name(self, name, limit=50):
+        return self.store.find_by_name(name, limit)
+
+    def import_users(self, file_path, max_workers=None, parallel_threshold=500):
+        parsed_rows, errors = read_import_file(file_path)
+        row_numbers = [row_number for row_number, _ in parsed_rows]
+        rows = [
+            {
+                field: str(row[field]) if row.get(field) is not None else None
+                for field in IMPORT_FIELDS
+            }
+            for _, row in parsed_rows
+        ]
+
+        if len(rows) >= parallel_threshold:
+            chunksize = max(1, len(rows) // ((max_workers or os.cpu_count() or 1) * 4))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(
+                    executor.map(build_user_record, rows, chunksize=chunksize)
+                )
+        else:
+            results = [build_user_record(row) for row in rows]
+
+        records = {}
+        provided_fields = {}
+        for row_number, row, (user_data, row_errors) in zip(row_numbers, rows, results):
+            if user_data is not None and user_data["employee_id"] in records:
+                row_errors = {"employee_id": "Duplicate employee ID in import file"}
+                user_data = None
+
+            if user_data is None:
+                errors.append(
+                    {
+                        "row": row_number,
+                        "employee_id": row.get("employee_id"),
+                        "errors": row_errors,
+                    }
+                )
+            else:
+                records[user_data["employee_id"]] = user_data
+                provided_fields[user_data["employee_id"]] = [
+                    field for field in IMPORT_FIELDS if (row.get(field) or "").strip()
+                ]
+
+        existing = self.store.get_many(list(records))
+        for employee_id, current in existing.items():
+            imported = records[employee_id]
+            records[employee_id] = {
+                **current,
+                **{field: imported[field] for field in provided_fields[employee_id]},
+            }
+
+        errors.sort(key=lambda error: error["row"])
+        saved = self.store.save_many(list(records.values())) if records else 0
+
+        return {
+            "imported": saved - len(existing),
+            "updated": len(existing),
+            "errors": errors,
+        }
+
+    def save_resume(self, resume_file, employee_id, chunk_size=1024 * 1024):
         safe_name = employee_id
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
         filename = f"{safe_name}_{timestamp}.pdf"
-        file_path = os.path.join(self.data_dir, "resumes", filename)
+        os.makedirs(self.resume_dir, exist_ok=True)
+        file_path = os.path.join(self.resume_dir, filename)
+        temp_path = f"{file_path}.part"
 
-        with open(file_path, "wb") as f:
-            f.write(resume_file.getvalue())
+        resume_file.seek(0)
+        with open(temp_path, "wb") as f:
+            shutil.copyfileobj(resume_file, f, chunk_size)
+        os.replace(temp_path, file_path)
+
+        self.prune_resumes(employee_id)
+        self.resume_executor.submit(self.index_resume, employee_id, file_path)
 
         return file_path
+
+    def latest_resumes(self):
+        latest = {}
+        if not os.path.isdir(self.resume_dir):
+            return latest
+
+        for filename in sorted(os.listdir(self.resume_dir)):
+            employee_id, _, timestamp = filename[: -len(".pdf")].rpartition("_")
+            if not filename.endswith(".pdf") or not employee_id:
+                continue
+            if timestamp.isdigit():
+                latest[employee_id] = os.path.join(self.resume_dir, filename)
+
+        return latest
+
+    def backfill_resume_index(self):
+        indexed = 0
+        for employee_id, file_path in self.latest_resumes().items():
+            if self.index_resume(employee_id, file_path):
+                indexed += 1
+
+        self.store.set_meta("resumes_indexed", "1")
+        return indexed
+
+    def list_resumes(self, employee_id):
+        pattern = os.path.join(self.resume_dir, f"{glob.escape(employee_id)}_*.pdf")
+        return sorted(
+            path
+            for path in glob.glob(pattern)
+            if os.path.basename(path)[len(employee_id) + 1 : -len(".pdf")].isdigit()
+        )
+
+    def prune_resumes(self, employee_id):
+        resumes = self.list_resumes(employee_id)
+        stale = resumes[: -self.resume_retention] if self.resume_retention else []
+
+        for path in stale:
+            self.store.remove_resume(path)
+            try:
+                os.unlink(path)
+            except OSError as e:
+                print(f"Error removing old resume {path}: {e}")
+
+        return stale
+
+    def index_resume(self, employee_id, file_path):
+        if not os.path.exists(file_path):
+            return False
+
+        try:
+            text = extract_resume_text(file_path)
+        except Exception as e:
+            print(f"Error extracting resume text from {file_path}: {e}")
+            return False
+
+        self.store.index_resume(employee_id, file_path, tokenize_text(text))
+        return True
+
+    def search_resumes(self, skills, limit=50):
+        if isinstance(skills, str):
+            skills = skills.replace(",", " ")
+        else:
+            skills = " ".join(skills)
+
+        results = []
+        for employee_id, path in self.store.search_resume_terms(
+            tokenize_text(skills), limit
+        ):
+            user_data = self.get_user_data(employee_id) or {"employee_id": employee_id}
+            results.append({**user_data, "resume": path})
+
+        return results
@@ -0,0 +1,257 @@
+import os
+import json
+import sqlite3
+import threading
+
+
+class UserStore:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.create_schema()
+
+    def create_schema(self):
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    employee_id TEXT PRIMARY KEY,
+                    name TEXT,
+                    email TEXT,
+                    phone TEXT,
+                    data TEXT NOT NULL
+                )
+                """)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_users_email ON users (email)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_users_phone ON users (phone)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_users_name ON users (name)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS resumes (
+                    employee_id TEXT PRIMARY KEY,
+                    path TEXT NOT NULL
+                )
+                """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS resume_terms (
+                    term TEXT NOT NULL,
+                    employee_id TEXT NOT NULL,
+                    PRIMARY KEY (term, employee_id)
+                ) WITHOUT ROWID
+                """)
+
+    @staticmethod
+    def index_values(user_data):
+        name = (user_data.get("name") or "").strip().lower()
+        email = (user_data.get("email") or "").strip().lower()
+        phone = (user_data.get("phone") or "").strip()
+        return name, email, phone
+
+    def save(self, user_data):
+        return self.save_many([user_data])
+
+    def user_rows(self, records):
+        rows = []
+        for user_data in records:
+            name, email, phone = self.index_values(user_data)
+            rows.append(
+                (
+                    str(user_data.get("employee_id")),
+                    name,
+                    email,
+                    phone,
+                    json.dumps(user_data),
+                )
+            )
+        return rows
+
+    def save_many(self, records):
+        rows = self.user_rows(records)
+
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO users (employee_id, name, email, phone, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+        return len(rows)
+
+    def query(self, sql, params):
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def get(self, employee_id):
+        rows = self.query(
+            "SELECT data FROM users WHERE employee_id = ?", (str(employee_id),)
+        )
+        return rows[0] if rows else None
+
+    def get_many(self, employee_ids, batch_size=500):
+        users = {}
+        employee_ids = [str(employee_id) for employee_id in employee_ids]
+
+        for start in range(0, len(employee_ids), batch_size):
+            batch = employee_ids[start : start + batch_size]
+            placeholders = ", ".join("?" for _ in batch)
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT employee_id, data FROM users "
+                    f"WHERE employee_id IN ({placeholders})",
+                    batch,
+                ).fetchall()
+            users.update({row["employee_id"]: json.loads(row["data"]) for row in rows})
+
+        return users
+
+    def find_by_email(self, email):
+        return self.query(
+            "SELECT data FROM users WHERE email = ?", (email.strip().lower(),)
+        )
+
+    def find_by_phone(self, phone):
+        return self.query("SELECT data FROM users WHERE phone = ?", (phone.strip(),))
+
+    def find_by_name(self, name, limit=50):
+        prefix = name.strip().lower()
+        return self.query(
+            "SELECT data FROM users WHERE name >= ? AND name < ? ORDER BY name LIMIT ?",
+            (prefix, prefix + "\uffff", limit),
+        )
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def get_meta(self, key):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row["value"] if row else None
+
+    def set_meta(self, key, value):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def index_resume(self, employee_id, path, terms):
+        employee_id = str(employee_id)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM resume_terms WHERE employee_id = ?", (employee_id,)
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO resumes (employee_id, path) VALUES (?, ?)",
+                (employee_id, path),
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO resume_terms (term, employee_id) VALUES (?, ?)",
+                [(term, employee_id) for term in set(terms)],
+            )
+
+    def remove_resume(self, path):
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT employee_id FROM resumes WHERE path = ?", (path,)
+            ).fetchone()
+            if row is None:
+                return False
+
+            self.conn.execute(
+                "DELETE FROM resume_terms WHERE employee_id = ?", (row["employee_id"],)
+            )
+            self.conn.execute("DELETE FROM resumes WHERE path = ?", (path,))
+
+        return True
+
+    def search_resume_terms(self, terms, limit=50):
+        terms = sorted(set(terms))
+        if not terms:
+            return []
+
+        placeholders = ", ".join("?" for _ in terms)
+        with self.lock:
+            rows = self.conn.execute(
+                f"""
+                SELECT r.employee_id, r.path FROM resume_terms t
+                JOIN resumes r ON r.employee_id = t.employee_id
+                WHERE t.term IN ({placeholders})
+                GROUP BY r.employee_id
+                HAVING COUNT(DISTINCT t.term) = ?
+                ORDER BY r.employee_id
+                LIMIT ?
+                """,
+                (*terms, len(terms), limit),
+            ).fetchall()
+
+        return [(row["employee_id"], row["path"]) for row in rows]
+
+    def migrate_json_files(self, data_dir):
+        if self.get_meta("json_migrated"):
+            return 0
+
+        records = []
+        failed = []
+        if os.path.isdir(data_dir):
+            for filename in sorted(os.listdir(data_dir)):
+                if not filename.endswith(".json"):
+                    continue
+
+                file_path = os.path.join(data_dir, filename)
+                try:
+                    with open(file_path, "r") as f:
+                        user_data = json.load(f)
+                    if not isinstance(user_data, dict):
+                        raise ValueError("expected a JSON object")
+                except (OSError, ValueError) as e:
+                    print(f"Error migrating {file_path}: {e}")
+                    failed.append(file_path)
+                    continue
+
+                user_data.setdefault("employee_id", filename[: -len(".json")])
+                records.append(user_data)
+
+        unresolved = []
+        for file_path in failed:
+            try:
+                os.replace(file_path, f"{file_path}.invalid")
+                print(f"Moved unreadable profile to {file_path}.invalid")
+            except OSError as e:
+                print(f"Error moving {file_path} aside: {e}")
+                unresolved.append(file_path)
+
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO users (employee_id, name, email, phone, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self.user_rows(records),
+            )
+            if not unresolved:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    ("json_migrated", "1"),
+                )
+
+        return len(records)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -1,4 +1,5 @@
-import phonenumbers
+import re
+from functools import lru_cache
 
 
 def sanitize_text(value, default="Not provided"):
@@ -6,14 +7,46 @@ def sanitize_text(value, default="Not provided"):
     return value if value else default
 
 
-def normalize_phone(phone):
+@lru_cache(maxsize=4096)
+def parse_phone(phone):
+    import phonenumbers
+
     try:
         parsed = phonenumbers.parse(phone, "IN")
-        if phonenumbers.is_valid_number(parsed):
-            return phonenumbers.format_number(
-                parsed, phonenumbers.PhoneNumberFormat.E164
-            )
-        else:
-            return "Invalid number"
     except phonenumbers.NumberParseException:
+        return None
+
+    if not phonenumbers.is_valid_number(parsed):
+        return None
+
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+
+
+def check_email(email, check_deliverability=True):
+    from email_validator import validate_email, EmailNotValidError
+
+    try:
+        validate_email(email, check_deliverability=check_deliverability)
+    except EmailNotValidError as e:
+        return str(e)
+    return ""
+
+
+@lru_cache(maxsize=4096)
+def check_email_syntax(email):
+    return check_email(email, check_deliverability=False)
+
+
+def normalize_phone(phone):
+    if not phone:
         return "Invalid number"
+
+    normalized = parse_phone(phone)
+    return normalized if normalized else "Invalid number"
+
+
+def tokenize_text(text):
+    return [
+        token.rstrip(".-")
+        for token in re.findall(r"[a-z0-9][a-z0-9+#.\-]*", text.lower())
+    ]
@@ -0,0 +1,107 @@
+import os
+import sys
+import argparse
+import subprocess
+
+TARGETS = {
+    "app": [
+        "streamlit",
+        "dotenv",
+        "modules.user_manager",
+        "modules.meeting_scheduler",
+        "modules.file_organizer",
+        "modules.llm_interface",
+        "modules.utils",
+    ],
+    "api": [
+        "dotenv",
+        "modules.user_manager",
+        "modules.meeting_scheduler",
+        "modules.file_organizer",
+        "modules.llm_interface",
+    ],
+    "user_manager": ["modules.user_manager"],
+    "utils": ["modules.utils"],
+    "llm": ["modules.llm_backends"],
+    "scheduler": ["modules.meeting_scheduler"],
+}
+
+
+def measure_imports(modules):
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+
+    timings = []
+    errors = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            errors.append(line)
+            continue
+
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+
+        self_us, cumulative_us, name = fields
+        timings.append(
+            {
+                "module": name.strip(),
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "top_level": not name[1:].startswith(" "),
+            }
+        )
+
+    return {
+        "ok": result.returncode == 0,
+        "total_ms": sum(t["cumulative_ms"] for t in timings if t["top_level"]),
+        "timings": timings,
+        "errors": errors,
+    }
+
+
+def print_report(name, report, top):
+    status = "ok" if report["ok"] else "FAILED"
+    print(f"== {name}: {report['total_ms']:.1f} ms total imports ({status})")
+
+    slowest = sorted(report["timings"], key=lambda t: t["cumulative_ms"], reverse=True)
+    for timing in slowest[:top]:
+        print(
+            f"  {timing['cumulative_ms']:9.1f} ms cumulative  "
+            f"{timing['self_ms']:8.1f} ms self  {timing['module']}"
+        )
+
+    if not report["ok"]:
+        for line in report["errors"][-3:]:
+            print(f"  ! {line}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report per-import startup time for the app entry points."
+    )
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        default=list(TARGETS),
+        help=f"Targets to measure (default: all of {', '.join(TARGETS)})",
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Number of slowest imports to list"
+    )
+    args = parser.parse_args()
+
+    for name in args.targets:
+        if name not in TARGETS:
+            parser.error(f"Unknown target: {name}")
+        print_report(name, measure_imports(TARGETS[name]), args.top)
+
+
+if __name__ == "__main__":
+    main()